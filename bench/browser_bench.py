@@ -0,0 +1,108 @@
+"""
+Browser MCP throughput benchmark
+────────────────────────────────
+Runs concurrent sessions that loop navigate + screenshot against local static
+pages (data: URLs, so the sandbox still applies and no network is needed),
+once in-process and once per worker count, and reports operations per second.
+
+    python bench/browser_bench.py --workers 0,1,2,4 --sessions 8 --iterations 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import urllib.parse
+from pathlib import Path
+
+# Must be set before mcp_server is imported; worker processes inherit them.
+os.environ.setdefault("MCP_HEADLESS", "true")
+os.environ.setdefault("MCP_RECORD_VIDEO", "false")
+os.environ.setdefault("MCP_WATCHDOG_INTERVAL", "0")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import mcp_server  # noqa: E402
+
+
+def static_page(index: int) -> str:
+    rows = "".join(f"<li style='color:hsl({(i * 37) % 360},60%,40%)'>Item {index}-{i}</li>"
+                   for i in range(500))
+    html = f"<html><head><title>Page {index}</title></head><body><h1>Page {index}</h1><ul>{rows}</ul></body></html>"
+    return "data:text/html," + urllib.parse.quote(html)
+
+
+PAGES = [static_page(i) for i in range(10)]
+
+
+async def session_loop(call, session: str, iterations: int, latencies: list[float]) -> int:
+    errors = 0
+    for i in range(iterations):
+        for name, args in (("navigate", {"url": PAGES[i % len(PAGES)]}), ("screenshot", {})):
+            start = time.perf_counter()
+            result = await call(name, {**args, "session_id": session})
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += bool(result.isError)
+    return errors
+
+
+async def run(workers: int, sessions: int, iterations: int) -> dict:
+    supervisor = None
+    if workers:
+        supervisor = mcp_server.BrowserSupervisor(workers)
+        supervisor.start()
+        call = supervisor.call
+    else:
+        call = mcp_server.run_tool
+    names = [f"bench-{i}" for i in range(sessions)]
+    try:
+        # Warm up: launch browsers and open every session's page.
+        await asyncio.gather(*(call("navigate", {"url": PAGES[0], "session_id": n}) for n in names))
+        latencies: list[float] = []
+        start = time.perf_counter()
+        errors = await asyncio.gather(*(session_loop(call, n, iterations, latencies) for n in names))
+        elapsed = time.perf_counter() - start
+    finally:
+        if supervisor:
+            await supervisor.stop()
+        else:
+            await mcp_server.close_all()
+    ops = sessions * iterations * 2
+    return {
+        "workers": workers,
+        "ops": ops,
+        "errors": sum(errors),
+        "elapsed_s": round(elapsed, 3),
+        "ops_per_s": round(ops / elapsed, 2),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(statistics.quantiles(latencies, n=20)[-1], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark browser sessions across worker processes.")
+    parser.add_argument("--workers", default="0,2,4",
+                        help="Comma-separated worker counts; 0 runs in-process")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=20, help="navigate+screenshot loops per session")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for workers in (int(w) for w in args.workers.split(",")):
+        r = asyncio.run(run(workers, args.sessions, args.iterations))
+        base = results[0]["ops_per_s"] if results else r["ops_per_s"]
+        r["speedup"] = round(r["ops_per_s"] / base, 2)
+        results.append(r)
+        print(f"workers={workers:<2} {r['ops_per_s']:>8.1f} ops/s  p50 {r['p50_ms']:>7.1f} ms  "
+              f"p95 {r['p95_ms']:>7.1f} ms  x{r['speedup']}  errors {r['errors']}", file=sys.stderr)
+    if args.output:
+        args.output.write_text(json.dumps({"sessions": args.sessions, "iterations": args.iterations,
+                                           "cpus": os.cpu_count(), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -7,11 +7,19 @@ Falls back to Playwright's bundled Chromium if Chrome isn't found.
 
 import asyncio
 import base64
+import collections
+import contextvars
+import hashlib
+import json
+import multiprocessing
 import os
 import re
 import sys
 import tempfile
+import threading
+import time
 import urllib.parse
+from html.parser import HTMLParser
 from pathlib import Path
 
 try:
@@ -29,15 +37,21 @@ except ImportError:
     sys.exit(1)
 
 try:
-    from aiohttp import web as aiohttp_web
+    from aiohttp import WSCloseCode, web as aiohttp_web
 except ImportError:
     print("ERROR: Run:  pip install aiohttp", file=sys.stderr)
     sys.exit(1)
 
+try:
+    import httpx
+except ImportError:
+    httpx = None  # read_url then always renders in the browser
+
 # ── Config ────────────────────────────────────────────────────────────────────
 SANDBOX_PROFILE = Path(tempfile.gettempdir()) / "browser-mcp-sandbox"
 HEADLESS = os.getenv("MCP_HEADLESS", "false").strip().lower() in {"1", "true", "yes", "on"}
 RECORD_VIDEO_DIR = Path(os.getenv("MCP_VIDEO_DIR", "/app/recordings"))
+RECORD_VIDEO = os.getenv("MCP_RECORD_VIDEO", "true").strip().lower() in {"1", "true", "yes", "on"}
 
 # Point to your REAL Chrome — avoids bot fingerprints that trigger CAPTCHAs.
 # Set to None to use Playwright's bundled Chromium instead.
@@ -83,95 +97,737 @@ BLOCKED = [
     re.compile(r"^file://"),
 ]
 
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/122.0.0.0 Safari/537.36"
+)
+
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+    // Spoof plugins to look like a real browser
+    Object.defineProperty(navigator, 'plugins', {
+        get: () => [1, 2, 3, 4, 5],
+    });
+    // Spoof languages
+    Object.defineProperty(navigator, 'languages', {
+        get: () => ['en-US', 'en'],
+    });
+"""
+
+# fetch_many: upper bound on concurrent throwaway pages, and resource types
+# they never load since only their text is returned.
+FETCH_MAX_PAGES = int(os.getenv("MCP_FETCH_MAX_PAGES", "8"))
+FETCH_SKIP_RESOURCES = {"image", "media", "font"}
+
+# read_url: plain HTTP fetches, cached on disk and revalidated with
+# ETag/Last-Modified, before falling back to the browser.
+HTTP_CACHE_DIR = Path(os.getenv("MCP_HTTP_CACHE_DIR", Path(tempfile.gettempdir()) / "browser-mcp-http-cache"))
+HTTP_CACHE_MAX_ENTRIES = int(os.getenv("MCP_HTTP_CACHE_MAX_ENTRIES", "256"))
+HTTP_MAX_BODY_BYTES = 5 * 1024 * 1024
+HTTP_MAX_REDIRECTS = 5
+# Responses that mean the plain client was turned away rather than served.
+HTTP_BLOCKED_STATUSES = {401, 403, 429, 503}
+JS_REQUIRED_MARKERS = (
+    "enable javascript",
+    "javascript is required",
+    "javascript is disabled",
+    "checking your browser",
+    "verify you are human",
+    "captcha",
+)
+
+# Watchdog: every WATCHDOG_INTERVAL seconds the Chromium processes' RSS is
+# sampled (Linux only) and the browser is recycled when a limit is exceeded.
+# 0 disables a limit.
+WATCHDOG_INTERVAL = float(os.getenv("MCP_WATCHDOG_INTERVAL", "15"))
+MAX_BROWSER_RSS_MB = int(os.getenv("MCP_MAX_BROWSER_RSS_MB", "1500"))
+MAX_RENDERER_RSS_MB = int(os.getenv("MCP_MAX_RENDERER_RSS_MB", "768"))
+
+# Live view: CDP screencast of the main page, served as MJPEG/WebSocket.
+# Frames are acked no faster than LIVE_MAX_FPS so Chrome encodes no more.
+# Clamped above 0: the ack delay is 1 / LIVE_MAX_FPS.
+LIVE_MAX_FPS = max(float(os.getenv("MCP_LIVE_MAX_FPS", "5")), 0.1)
+LIVE_QUALITY = int(os.getenv("MCP_LIVE_QUALITY", "60"))
+
+# Sessions: tools take an optional session_id; every session other than the
+# default one gets its own page. With MCP_BROWSER_WORKERS > 0 sessions are
+# spread over that many worker processes, each with its own Chromium.
+DEFAULT_SESSION = "default"
+MAX_SESSION_PAGES = int(os.getenv("MCP_MAX_SESSION_PAGES", "16"))
+BROWSER_WORKERS = int(os.getenv("MCP_BROWSER_WORKERS", "0"))
+
+# search(structured=true): results parsed out of the Google results page are
+# kept per normalized query, so repeats skip the page load entirely.
+SEARCH_CACHE_TTL = float(os.getenv("MCP_SEARCH_CACHE_TTL", "600"))
+SEARCH_CACHE_SIZE = int(os.getenv("MCP_SEARCH_CACHE_SIZE", "128"))
+SEARCH_MAX_RESULTS = 20
+
+# One round trip: every organic result title (an h3 inside a link) with its
+# URL and the snippet text of the surrounding result block.
+SEARCH_RESULTS_SCRIPT = """
+(max) => {
+    const results = [];
+    const seen = new Set();
+    for (const h3 of document.querySelectorAll('#search a h3, #rso a h3')) {
+        const link = h3.closest('a');
+        let url = link.href;
+        try {
+            const u = new URL(url);
+            if (u.hostname.endsWith('google.com') && u.pathname === '/url') {
+                url = u.searchParams.get('q') || u.searchParams.get('url') || url;
+            }
+        } catch (e) {}
+        if (!/^https?:/.test(url) || seen.has(url)) continue;
+        seen.add(url);
+        const block = link.closest('div.g, div.MjjYud, div[data-hveid]') || link.parentElement;
+        const snip = block && block.querySelector(
+            '[data-sncf], .VwiC3b, div[style*="-webkit-line-clamp"]');
+        results.push({
+            title: h3.innerText.trim(),
+            url: url,
+            snippet: snip ? snip.innerText.replace(/\\s+/g, ' ').trim() : '',
+        });
+        if (results.length >= max) break;
+    }
+    return results;
+}
+"""
+
 # ── State ─────────────────────────────────────────────────────────────────────
 _pw = None
 _context = None
 _page = None
+# Throwaway pages opened by fetch_many; close_popups must leave them alone.
+_worker_pages = set()
+_worker_page_lock = asyncio.Lock()
+_http_client = None
+_launch_lock = asyncio.Lock()
+_recycle_lock = asyncio.Lock()
+_closing = False
+_active_calls = 0
+_memory_sample = {}
+_recycle_log = collections.deque(maxlen=50)
+_record_video = RECORD_VIDEO
+# One single-slot queue per live viewer; a slow viewer just misses frames.
+_live_viewers = set()
+_live_cdp = None
+_live_page = None
+_session = contextvars.ContextVar("browser_session", default=DEFAULT_SESSION)
+# Session id -> page, least recently used first.
+_session_pages = {}
+_is_worker = False
+_closed_sessions = []  # evicted or closed since the last reply to the supervisor
+_supervisor = None
+_search_cache = collections.OrderedDict()  # normalized query -> (expires, results)
+
+
+async def block_local(route):
+    if any(p.match(route.request.url) for p in BLOCKED):
+        print(f"[SANDBOX BLOCKED] {route.request.url}", file=sys.stderr)
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def block_local_text_only(route):
+    if route.request.resource_type in FETCH_SKIP_RESOURCES:
+        await route.abort()
+    else:
+        await block_local(route)
 
 
 async def get_page():
-    global _pw, _context, _page
     if _page is None:
-        _pw = await async_playwright().start()
-        SANDBOX_PROFILE.mkdir(parents=True, exist_ok=True)
-        RECORD_VIDEO_DIR.mkdir(parents=True, exist_ok=True)
+        async with _launch_lock:
+            if _page is None:
+                await launch_browser()
+    session = _session.get()
+    if session == DEFAULT_SESSION:
+        return _page
+    return await get_session_page(session)
+
+
+async def get_session_page(session: str):
+    """Return the session's own page in the shared context, opening it if needed."""
+    async with _worker_page_lock:
+        page = _session_pages.pop(session, None)
+        if page is None or page.is_closed():
+            page = await _context.new_page()
+            _worker_pages.add(page)  # so close_popups leaves it open
+            await page.add_init_script(STEALTH_SCRIPT)
+            await page.route("**/*", block_local)
+        _session_pages[session] = page
+        evicted = list(_session_pages)[:-MAX_SESSION_PAGES] if MAX_SESSION_PAGES > 0 else []
+        forget_sessions(evicted)
+        evicted = [_session_pages.pop(sid) for sid in evicted]
+    for old in evicted:
+        await close_session_page(old)
+    return page
+
+
+def forget_sessions(sessions: list[str]):
+    # Only a worker's supervisor routes by session; in-process nobody drains this.
+    if _is_worker:
+        _closed_sessions.extend(sessions)
+
+
+async def close_session_page(page):
+    _worker_pages.discard(page)
+    try:
+        await page.close()
+    except Exception as e:
+        print(f"[browser-mcp] Session page close failed: {type(e).__name__}: {e}", file=sys.stderr)
+
 
-        chrome_path = find_chrome()
+async def launch_browser():
+    global _pw, _context, _page
+    _pw = await async_playwright().start()
+    SANDBOX_PROFILE.mkdir(parents=True, exist_ok=True)
+    RECORD_VIDEO_DIR.mkdir(parents=True, exist_ok=True)
 
-        _context = await _pw.chromium.launch_persistent_context(
+    chrome_path = find_chrome()
+    video = {
+        "record_video_dir": str(RECORD_VIDEO_DIR),
+        "record_video_size": {"width": 1280, "height": 800},
+    } if _record_video else {}
+
+    try:
+        context = await _pw.chromium.launch_persistent_context(
             str(SANDBOX_PROFILE),
             headless=HEADLESS,
             executable_path=chrome_path,   # None = use bundled Chromium
             args=CHROMIUM_ARGS,
             viewport={"width": 1280, "height": 800},
             accept_downloads=False,
-            record_video_dir=str(RECORD_VIDEO_DIR),
-            record_video_size={"width": 1280, "height": 800},
             # Spoof a real user agent
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/122.0.0.0 Safari/537.36"
-            ),
+            user_agent=USER_AGENT,
+            **video,
         )
-        _page = await _context.new_page()
-
-        # Remove the webdriver property that sites check for bots
-        await _page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-            // Spoof plugins to look like a real browser
-            Object.defineProperty(navigator, 'plugins', {
-                get: () => [1, 2, 3, 4, 5],
-            });
-            // Spoof languages
-            Object.defineProperty(navigator, 'languages', {
-                get: () => ['en-US', 'en'],
-            });
-        """)
-
-        async def block_local(route):
-            if any(p.match(route.request.url) for p in BLOCKED):
-                print(f"[SANDBOX BLOCKED] {route.request.url}", file=sys.stderr)
-                await route.abort()
-            else:
-                await route.continue_()
+    except Exception:
+        # Don't leak a Playwright driver per failed launch.
+        await _pw.stop()
+        _pw = None
+        raise
+    page = await context.new_page()
+
+    # Remove the webdriver property that sites check for bots
+    await page.add_init_script(STEALTH_SCRIPT)
+    await page.route("**/*", block_local)
+
+    async def close_popups(new_page):
+        async with _worker_page_lock:
+            if new_page in _worker_pages:
+                return
+        if new_page is not page:
+            # Stop the recording before closing so Playwright doesn't
+            # save a blank .webm for this throwaway page.
+            if new_page.video:
+                try:
+                    await new_page.video.delete()
+                except Exception:
+                    pass
+            await new_page.close()
+
+    def schedule_close_popups(new_page):
+        asyncio.ensure_future(close_popups(new_page))
+
+    context.on("page", schedule_close_popups)
+
+    # A crashed renderer or dead browser leaves _page stale; relaunch it.
+    # Events from a browser that was already replaced are ignored.
+    def on_crash(_):
+        if page is _page:
+            print("[browser-mcp] Page crashed", file=sys.stderr)
+            asyncio.ensure_future(recycle_browser("page crashed"))
+
+    def on_close(_):
+        if not _closing and page is _page:
+            asyncio.ensure_future(recycle_browser("page or browser closed"))
+
+    page.on("crash", on_crash)
+    page.on("close", on_close)
+    context.on("close", on_close)
+
+    # Publish only once the sandbox route is in place.
+    _context, _page = context, page
+    if _live_viewers:
+        asyncio.ensure_future(start_screencast())
+
+
+async def open_worker_page():
+    """Open a throwaway page that shares the session's cookies and sandbox."""
+    await get_page()
+    async with _worker_page_lock:
+        pg = await _context.new_page()
+        _worker_pages.add(pg)
+    await pg.add_init_script(STEALTH_SCRIPT)
+    await pg.route("**/*", block_local_text_only)
+    return pg
+
+
+async def close_worker_page(pg):
+    _worker_pages.discard(pg)
+    try:
+        await pg.close()
+        # Only the main page's recording is worth keeping.
+        if pg.video:
+            await pg.video.delete()
+    except Exception as e:
+        print(f"[browser-mcp] Worker page close failed: {type(e).__name__}: {e}", file=sys.stderr)
 
-        await _page.route("**/*", block_local)
 
-        async def close_popups(new_page):
-            if new_page is not _page:
-                # Stop the recording before closing so Playwright doesn't
-                # save a blank .webm for this throwaway page.
-                if new_page.video:
-                    try:
-                        await new_page.video.delete()
-                    except Exception:
-                        pass
-                await new_page.close()
+def truncate_bytes(text: str, max_bytes: int) -> str:
+    data = text.encode()
+    if len(data) <= max_bytes:
+        return text
+    return data[:max_bytes].decode(errors="ignore") + "\n...[truncated]"
 
-        def schedule_close_popups(new_page):
-            asyncio.ensure_future(close_popups(new_page))
 
-        _context.on("page", schedule_close_popups)
+async def fetch_text(url: str, sem: asyncio.Semaphore, timeout_ms: int, max_bytes: int) -> dict:
+    if any(p.match(url) for p in BLOCKED):
+        return {"url": url, "error": "Blocked by sandbox policy."}
+    async with sem:
+        pg = await open_worker_page()
+        try:
+            async def load():
+                resp = await pg.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+                text = await pg.evaluate("() => document.body ? document.body.innerText : ''")
+                return {"url": url, "final_url": pg.url, "status": resp.status if resp else None,
+                        "title": await pg.title(), "text": truncate_bytes(text or "", max_bytes)}
+            # goto has its own timeout; this one also bounds the extraction.
+            return await asyncio.wait_for(load(), timeout_ms / 1000 + 5)
+        except Exception as e:
+            return {"url": url, "error": f"{type(e).__name__}: {e}"}
+        finally:
+            await close_worker_page(pg)
+
+# ── Lightweight HTTP reader ───────────────────────────────────────────────────
+class HTMLToText(HTMLParser):
+    """Convert HTML to readable markdown-ish text without rendering it."""
+
+    SKIP = {"script", "style", "noscript", "template", "svg", "iframe", "canvas"}
+    BLOCK = {"p", "div", "section", "article", "main", "header", "footer", "aside", "nav",
+             "br", "tr", "table", "ul", "ol", "form", "blockquote", "pre", "hr", "figure", "dl", "dt", "dd"}
+
+    def __init__(self, base_url: str):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.parts = []
+        self.title = ""
+        self.script_count = 0
+        self._skip = 0
+        self._in_title = False
+        self._links = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "script":
+            self.script_count += 1
+        if tag == "title":
+            self._in_title = True
+        if tag in self.SKIP:
+            self._skip += 1
+        if self._skip:
+            return
+        if re.fullmatch(r"h[1-6]", tag):
+            self.parts.append("\n\n" + "#" * int(tag[1]) + " ")
+        elif tag == "li":
+            self.parts.append("\n- ")
+        elif tag in self.BLOCK:
+            self.parts.append("\n")
+        elif tag == "a":
+            self._links.append((len(self.parts), dict(attrs).get("href")))
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        if tag in self.SKIP:
+            self._skip = max(0, self._skip - 1)
+            return
+        if self._skip:
+            return
+        if tag == "a" and self._links:
+            start, href = self._links.pop()
+            label = " ".join("".join(self.parts[start:]).split())
+            href = urllib.parse.urljoin(self.base_url, href) if href else ""
+            if label and href.startswith(("http://", "https://")):
+                self.parts[start:] = [f"[{label}]({href})"]
+        elif re.fullmatch(r"h[1-6]", tag) or tag in self.BLOCK:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip:
+            self.parts.append(data)
+
+    def text(self) -> str:
+        lines = (" ".join(line.split()) for line in "".join(self.parts).splitlines())
+        return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def html_to_text(html: str, base_url: str) -> tuple[str, str, int]:
+    parser = HTMLToText(base_url)
+    parser.feed(html)
+    parser.close()
+    return " ".join(parser.title.split()), parser.text(), parser.script_count
+
+
+def needs_browser(status: int, text: str, script_count: int) -> str | None:
+    """Return why a plain HTTP read is not good enough, or None if it is."""
+    if status in HTTP_BLOCKED_STATUSES:
+        return f"HTTP {status}"
+    head = text[:3000].lower()
+    if any(m in head for m in JS_REQUIRED_MARKERS):
+        return "page asks for JavaScript or a bot check"
+    if len(text) < 200 and script_count:
+        return "little static text, likely rendered by JavaScript"
+    return None
+
 
-    return _page
+def _cache_paths(url: str) -> tuple[Path, Path]:
+    key = hashlib.sha256(url.encode()).hexdigest()
+    return HTTP_CACHE_DIR / f"{key}.json", HTTP_CACHE_DIR / f"{key}.body"
+
+
+def cache_load(url: str) -> tuple[dict, bytes] | None:
+    meta_path, body_path = _cache_paths(url)
+    try:
+        return json.loads(meta_path.read_text()), body_path.read_bytes()
+    except (OSError, ValueError):
+        return None
+
+
+def cache_touch(url: str):
+    for path in _cache_paths(url):
+        try:
+            path.touch()
+        except OSError:
+            pass
+
+
+def cache_store(url: str, meta: dict, body: bytes):
+    HTTP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    meta_path, body_path = _cache_paths(url)
+    body_path.write_bytes(body)
+    meta_path.write_text(json.dumps(meta))
+    entries = sorted(HTTP_CACHE_DIR.glob("*.json"), key=lambda f: f.stat().st_mtime)
+    for old in entries[:max(0, len(entries) - HTTP_CACHE_MAX_ENTRIES)]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".body").unlink(missing_ok=True)
+
+
+def get_http_client():
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            headers={
+                "User-Agent": USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml,text/plain;q=0.9,*/*;q=0.8",
+                "Accept-Language": "en-US,en;q=0.9",
+            },
+            timeout=20.0,
+            follow_redirects=False,  # every hop is checked against BLOCKED
+        )
+    return _http_client
+
+
+async def http_fetch(url: str) -> dict:
+    """GET url without the browser, revalidating the on-disk cache."""
+    cached = await asyncio.to_thread(cache_load, url)
+    validators = {}
+    if cached:
+        if cached[0].get("etag"):
+            validators["If-None-Match"] = cached[0]["etag"]
+        if cached[0].get("last_modified"):
+            validators["If-Modified-Since"] = cached[0]["last_modified"]
+
+    target = url
+    for _ in range(HTTP_MAX_REDIRECTS + 1):
+        if any(p.match(target) for p in BLOCKED):
+            raise PermissionError(f"Blocked by sandbox policy: {target}")
+        # The entry is keyed by the requested URL but its validators belong to
+        # the URL that served it, which may be a few redirects further on.
+        headers = validators if cached and target == cached[0].get("url") else {}
+        async with get_http_client().stream("GET", target, headers=headers) as resp:
+            if resp.status_code == 304 and cached:
+                await asyncio.to_thread(cache_touch, url)
+                meta, body = cached
+                return {**meta, "body": body, "cached": True}
+            if resp.is_redirect and "location" in resp.headers:
+                target = urllib.parse.urljoin(target, resp.headers["location"])
+                continue
+            body = bytearray()
+            truncated = False
+            async for chunk in resp.aiter_bytes():
+                body += chunk
+                if len(body) >= HTTP_MAX_BODY_BYTES:
+                    truncated = True
+                    break
+            meta = {
+                "url": str(resp.url),
+                "status": resp.status_code,
+                "content_type": resp.headers.get("content-type", ""),
+                "encoding": resp.charset_encoding or "utf-8",
+                "etag": resp.headers.get("etag"),
+                "last_modified": resp.headers.get("last-modified"),
+            }
+            if resp.status_code == 200 and not truncated and (meta["etag"] or meta["last_modified"]):
+                await asyncio.to_thread(cache_store, url, meta, bytes(body))
+            return {**meta, "body": bytes(body), "cached": False}
+    raise RuntimeError(f"Too many redirects: {url}")
+
+
+async def read_via_http(url: str) -> dict:
+    res = await http_fetch(url)
+    ctype = res["content_type"].split(";")[0].strip().lower()
+    raw = res["body"].decode(res["encoding"], errors="replace")
+    if ctype in {"text/html", "application/xhtml+xml"} or (not ctype and "<html" in raw[:1000].lower()):
+        title, text, scripts = await asyncio.to_thread(html_to_text, raw, res["url"])
+    elif ctype.startswith("text/") or ctype in {"application/json", "application/xml"}:
+        title, text, scripts = "", raw, 0
+    else:
+        return {**res, "title": "", "text": "", "fallback": f"unsupported content type {ctype!r}"}
+    return {**res, "title": title, "text": text, "fallback": needs_browser(res["status"], text, scripts)}
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def search_cache_get(key: str) -> list[dict] | None:
+    entry = _search_cache.get(key)
+    if not entry:
+        return None
+    expires, results = entry
+    if expires < time.monotonic():
+        del _search_cache[key]
+        return None
+    _search_cache.move_to_end(key)
+    return results
+
+
+def search_cache_put(key: str, results: list[dict]):
+    if SEARCH_CACHE_TTL <= 0 or SEARCH_CACHE_SIZE <= 0:
+        return
+    _search_cache[key] = (time.monotonic() + SEARCH_CACHE_TTL, results)
+    _search_cache.move_to_end(key)
+    while len(_search_cache) > SEARCH_CACHE_SIZE:
+        _search_cache.popitem(last=False)
 
 
 async def close_all():
-    global _pw, _context, _page
-    if _page and _page.video:
+    global _pw, _context, _page, _closing
+    _closing = True
+    try:
+        if _page and _page.video:
+            try:
+                await _page.close()
+            except Exception as e:
+                print(f"[browser-mcp] Page close failed: {type(e).__name__}: {e}", file=sys.stderr)
+        # The browser may already be gone after a crash.
+        for closer in (_context and _context.close, _pw and _pw.stop):
+            if closer:
+                try:
+                    await closer()
+                except Exception as e:
+                    print(f"[browser-mcp] Browser close failed: {type(e).__name__}: {e}", file=sys.stderr)
+        _pw = _context = _page = None
+        _session_pages.clear()
+        _worker_pages.clear()
+    finally:
+        _closing = False
+    if _record_video:
+        print("[browser-mcp] Browser closed. Recordings saved as .webm in:", RECORD_VIDEO_DIR, file=sys.stderr)
+    else:
+        print("[browser-mcp] Browser closed.", file=sys.stderr)
+
+
+# ── Live view ─────────────────────────────────────────────────────────────────
+def offer_frame(queue: asyncio.Queue, frame: bytes):
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(frame)
+
+
+async def set_recording(enabled: bool) -> bool:
+    """Switch video recording; an open browser is relaunched to apply it."""
+    global _record_video
+    if enabled == _record_video:
+        return False
+    _record_video = enabled
+    await recycle_browser(f"recording turned {'on' if enabled else 'off'}")
+    return True
+
+
+async def start_screencast():
+    """Screencast the main page while there are viewers."""
+    global _live_cdp, _live_page
+    if not _live_viewers or _page is None or _live_page is _page:
+        return
+    page = _live_page = _page
+    try:
+        cdp = _live_cdp = await _context.new_cdp_session(page)
+    except Exception:
+        _live_page = None
+        raise
+
+    async def ack(session_id):
+        await asyncio.sleep(1 / LIVE_MAX_FPS)
         try:
-            await _page.close()
+            await cdp.send("Page.screencastFrameAck", {"sessionId": session_id})
+        except Exception:
+            pass  # page closed or screencast stopped
+
+    def on_frame(params):
+        frame = base64.b64decode(params["data"])
+        for queue in list(_live_viewers):
+            offer_frame(queue, frame)
+        asyncio.ensure_future(ack(params["sessionId"]))
+
+    cdp.on("Page.screencastFrame", on_frame)
+    try:
+        await cdp.send("Page.startScreencast", {
+            "format": "jpeg", "quality": LIVE_QUALITY, "maxWidth": 1280, "maxHeight": 800,
+        })
+    except Exception:
+        await stop_screencast()  # so the next viewer or launch tries again
+        raise
+
+
+async def stop_screencast():
+    global _live_cdp, _live_page
+    cdp, _live_cdp, _live_page = _live_cdp, None, None
+    if cdp:
+        try:
+            await cdp.send("Page.stopScreencast")
+            await cdp.detach()
+        except Exception:
+            pass
+
+
+async def add_live_viewer() -> asyncio.Queue:
+    if _supervisor:
+        raise RuntimeError("the live view is not available with MCP_BROWSER_WORKERS")
+    queue = asyncio.Queue(maxsize=1)
+    _live_viewers.add(queue)
+    try:
+        await start_screencast()
+    except Exception:
+        # An orphaned queue would keep the screencast running for nobody.
+        await remove_live_viewer(queue)
+        raise
+    return queue
+
+
+async def remove_live_viewer(queue: asyncio.Queue):
+    _live_viewers.discard(queue)
+    if not _live_viewers:
+        await stop_screencast()
+
+
+# ── Watchdog ──────────────────────────────────────────────────────────────────
+def sample_browser_memory() -> dict | None:
+    """Sum the RSS of Chromium processes started by this server (Linux /proc)."""
+    proc = Path("/proc")
+    if not (proc / "self" / "stat").exists():
+        return None
+    children = collections.defaultdict(list)
+    for stat in proc.glob("[0-9]*/stat"):
+        try:
+            # Fields after the parenthesised command name: state, ppid, ...
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+            children[int(fields[1])].append(int(stat.parent.name))
+        except (OSError, IndexError, ValueError):
+            continue
+    total = renderer_max = count = 0
+    todo = list(children[os.getpid()])
+    while todo:
+        pid = todo.pop()
+        todo.extend(children[pid])
+        try:
+            cmdline = (proc / str(pid) / "cmdline").read_bytes()
+            status = (proc / str(pid) / "status").read_text()
+        except OSError:
+            continue
+        if b"chrom" not in cmdline.lower():
+            continue
+        match = re.search(r"^VmRSS:\s+(\d+) kB", status, re.M)
+        rss = int(match.group(1)) / 1024 if match else 0
+        total += rss
+        count += 1
+        if b"--type=renderer" in cmdline:
+            renderer_max = max(renderer_max, rss)
+    return {"browser_rss_mb": round(total, 1), "max_renderer_rss_mb": round(renderer_max, 1),
+            "processes": count, "sampled_at": time.time()}
+
+
+def memory_limit_exceeded(sample: dict) -> str | None:
+    if MAX_BROWSER_RSS_MB and sample["browser_rss_mb"] > MAX_BROWSER_RSS_MB:
+        return f"browser RSS {sample['browser_rss_mb']} MB > {MAX_BROWSER_RSS_MB} MB"
+    if MAX_RENDERER_RSS_MB and sample["max_renderer_rss_mb"] > MAX_RENDERER_RSS_MB:
+        return f"renderer RSS {sample['max_renderer_rss_mb']} MB > {MAX_RENDERER_RSS_MB} MB"
+    return None
+
+
+async def restore_url(pg, url: str | None):
+    if url and url.startswith("http") and not any(p.match(url) for p in BLOCKED):
+        try:
+            await pg.goto(url, wait_until="domcontentloaded", timeout=30_000)
         except Exception as e:
-            print(f"[browser-mcp] Page close failed: {type(e).__name__}: {e}", file=sys.stderr)
-    if _context:
-        await _context.close()
-    if _pw:
-        await _pw.stop()
-    _pw = _context = _page = None
-    print("[browser-mcp] Browser closed. Recordings saved as .webm in:", RECORD_VIDEO_DIR, file=sys.stderr)
+            print(f"[browser-mcp] Restore of {url} failed: {type(e).__name__}: {e}", file=sys.stderr)
+
+
+async def recycle_browser(reason: str, idle_only: bool = False):
+    """Relaunch the browser, keeping the current URLs and cookies.
+
+    Tool calls wait in run_tool while this holds _recycle_lock, so with
+    idle_only the check for running calls cannot go stale before close_all.
+    """
+    async with _recycle_lock:
+        if _context is None or (idle_only and _active_calls):
+            return
+        url = _page.url if _page else None
+        session_urls = {sid: pg.url for sid, pg in _session_pages.items() if not pg.is_closed()}
+        cookies = []
+        try:
+            cookies = await _context.cookies()
+        except Exception:
+            pass  # browser already dead; the persistent profile still has them
+        print(f"[browser-mcp] Recycling browser ({reason}) at {url}", file=sys.stderr)
+        await close_all()
+        token = _session.set(DEFAULT_SESSION)
+        try:
+            pg = await get_page()
+            if cookies:
+                await _context.add_cookies(cookies)
+            await restore_url(pg, url)
+        finally:
+            _session.reset(token)
+        for session, session_url in session_urls.items():
+            await restore_url(await get_session_page(session), session_url)
+        _recycle_log.append({"time": time.time(), "reason": reason, "url": url})
+
+
+async def watchdog():
+    while True:
+        await asyncio.sleep(WATCHDOG_INTERVAL)
+        if _context is None:
+            continue
+        try:
+            sample = await asyncio.to_thread(sample_browser_memory)
+            if not sample:
+                continue
+            _memory_sample.clear()
+            _memory_sample.update(sample)
+            reason = memory_limit_exceeded(sample)
+            # Recycling under a running tool call would break it; retry next tick.
+            if reason:
+                await recycle_browser(reason, idle_only=True)
+        except Exception as e:
+            print(f"[browser-mcp] Watchdog error: {type(e).__name__}: {e}", file=sys.stderr)
 
 
 async def snap() -> str:
@@ -194,22 +850,35 @@ def err(msg: str) -> CallToolResult:
     )
 
 
+def read_result(text: str, status: int | None) -> CallToolResult:
+    """read_url output; error pages (4xx/5xx) keep their text but fail the call."""
+    if status and status >= 400:
+        return err(f"HTTP {status}\n{text}")
+    return ok(text)
+
+
 # ── MCP Server ────────────────────────────────────────────────────────────────
 app = Server("browser-mcp")
 
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
-    return [
+    tools = [
         Tool(name="navigate",
              description="Go to a URL in the sandboxed browser.",
              inputSchema={"type": "object",
                           "properties": {"url": {"type": "string"}},
                           "required": ["url"]}),
         Tool(name="search",
-             description="Google search — opens results page.",
+             description="Google search — opens results page. With structured=true returns "
+                         "title/url/snippet JSON instead of a screenshot (repeat queries are cached).",
              inputSchema={"type": "object",
-                          "properties": {"query": {"type": "string"}},
+                          "properties": {
+                              "query": {"type": "string"},
+                              "structured": {"type": "boolean", "default": False},
+                              "max_results": {"type": "number",
+                                              "description": f"Results to return (<= {SEARCH_MAX_RESULTS})"},
+                          },
                           "required": ["query"]}),
         Tool(name="click",
              description="Click an element. Use 'selector' (CSS) or 'text' (visible label).",
@@ -241,6 +910,17 @@ async def list_tools() -> list[Tool]:
                               "selector": {"type": "string"},
                               "max_length": {"type": "number"},
                           }}),
+        Tool(name="read_url",
+             description="Read a page as text/markdown with a plain HTTP request (fast, cached). "
+                         "Falls back to the browser when the page needs JavaScript or blocks bots.",
+             inputSchema={"type": "object",
+                          "properties": {
+                              "url": {"type": "string"},
+                              "max_length": {"type": "number"},
+                              "render": {"type": "string", "enum": ["auto", "never", "always"],
+                                         "description": "auto: browser only if needed (default)"},
+                          },
+                          "required": ["url"]}),
         Tool(name="screenshot",
              description="Capture the current viewport as a JPEG image.",
              inputSchema={"type": "object", "properties": {}}),
@@ -257,18 +937,62 @@ async def list_tools() -> list[Tool]:
                               "selector": {"type": "string"},
                               "ms": {"type": "number"},
                           }}),
+        Tool(name="fetch_many",
+             description="Load several URLs concurrently in throwaway pages and return their "
+                         "visible text (no screenshots). The main page is left untouched.",
+             inputSchema={"type": "object",
+                          "properties": {
+                              "urls": {"type": "array", "items": {"type": "string"}},
+                              "concurrency": {"type": "number",
+                                              "description": f"Max parallel pages (<= {FETCH_MAX_PAGES})"},
+                              "max_bytes": {"type": "number", "description": "Text budget per page"},
+                              "timeout_ms": {"type": "number", "description": "Timeout per page"},
+                          },
+                          "required": ["urls"]}),
+        Tool(name="set_recording",
+             description="Turn .webm session recording on or off. Restarts an open browser "
+                         "(keeping URL and cookies) to apply.",
+             inputSchema={"type": "object",
+                          "properties": {"enabled": {"type": "boolean"}},
+                          "required": ["enabled"]}),
         Tool(name="close_browser",
              description="Close the sandboxed browser.",
              inputSchema={"type": "object", "properties": {}}),
     ]
+    for tool in tools:
+        tool.inputSchema["properties"]["session_id"] = {
+            "type": "string",
+            "description": "Optional browser session; each session has its own page.",
+        }
+    return tools
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: dict) -> CallToolResult:
+    if _supervisor:
+        try:
+            return await _supervisor.call(name, arguments or {})
+        except Exception as e:
+            return err(f"{type(e).__name__}: {e}")
+    return await run_tool(name, arguments or {})
+
+
+async def run_tool(name: str, a: dict) -> CallToolResult:
+    """Run a tool against this process's browser, in the caller's session."""
+    global _active_calls
+    if _recycle_lock.locked():
+        # Don't hand out pages that a running recycle is about to close.
+        async with _recycle_lock:
+            pass
+    _active_calls += 1
+    token = _session.set(a.pop("session_id", None) or DEFAULT_SESSION)
     try:
-        return await _run(name, arguments or {})
+        return await _run(name, a)
     except Exception as e:
         return err(f"{type(e).__name__}: {e}")
+    finally:
+        _session.reset(token)
+        _active_calls -= 1
 
 
 async def _run(name: str, a: dict) -> CallToolResult:
@@ -282,6 +1006,23 @@ async def _run(name: str, a: dict) -> CallToolResult:
 
     elif name == "search":
         q = urllib.parse.quote_plus(a["query"])
+        if a.get("structured"):
+            limit = max(1, min(int(a.get("max_results", 10)), SEARCH_MAX_RESULTS))
+            key = normalize_query(a["query"])
+            results = search_cache_get(key)
+            cached = results is not None
+            if not cached:
+                pg = await get_page()
+                await pg.goto(f"https://www.google.com/search?q={q}",
+                              wait_until="domcontentloaded", timeout=30_000)
+                results = await pg.evaluate(SEARCH_RESULTS_SCRIPT, SEARCH_MAX_RESULTS)
+                # An empty page is a consent wall or CAPTCHA, not an answer worth keeping.
+                if results:
+                    search_cache_put(key, results)
+            body = {"query": a["query"], "cached": cached, "results": results[:limit]}
+            if not results:
+                body["note"] = "No results parsed; take a screenshot to see what Google returned."
+            return ok(json.dumps(body, ensure_ascii=False, indent=1))
         pg = await get_page()
         await pg.goto(f"https://www.google.com/search?q={q}",
                       wait_until="domcontentloaded", timeout=30_000)
@@ -325,6 +1066,42 @@ async def _run(name: str, a: dict) -> CallToolResult:
             text = text[:max_len] + "\n...[truncated]"
         return ok(text)
 
+    elif name == "read_url":
+        url = a["url"]
+        if any(p.match(url) for p in BLOCKED):
+            return err("Blocked by sandbox policy.")
+        max_len = int(a.get("max_length", 8000))
+        render = a.get("render", "auto")
+        if render == "never" and httpx is None:
+            return err("render=never needs httpx (pip install httpx).")
+        reason = "render=always" if render == "always" else "httpx not installed"
+        if render != "always" and httpx is not None:
+            try:
+                res = await read_via_http(url)
+                reason = res["fallback"]
+            except PermissionError as e:
+                return err(str(e))
+            except Exception as e:
+                res, reason = None, f"{type(e).__name__}: {e}"
+            if res and (not reason or render == "never"):
+                text = res["text"]
+                if len(text) > max_len:
+                    text = text[:max_len] + "\n...[truncated]"
+                source = "http (cached)" if res["cached"] else "http"
+                note = f"\nWarning: {reason}" if reason else ""
+                return read_result(f"Source: {source}\nURL: {res['url']}\nStatus: {res['status']}\n"
+                                   f"Title: {res['title']}{note}\n\n{text}", res["status"])
+            if render == "never":
+                return err(reason)
+        res = await fetch_text(url, asyncio.Semaphore(1), 30_000, max_len * 4)
+        if "error" in res:
+            return err(res["error"])
+        text = res["text"]
+        if len(text) > max_len:
+            text = text[:max_len] + "\n...[truncated]"
+        return read_result(f"Source: browser ({reason})\nURL: {res['final_url']}\nStatus: {res['status']}\n"
+                           f"Title: {res['title']}\n\n{text}", res["status"])
+
     elif name == "screenshot":
         pg = await get_page()
         return ok(f"Screenshot of: {pg.url}", await snap())
@@ -348,18 +1125,261 @@ async def _run(name: str, a: dict) -> CallToolResult:
             return ok(f"Waited {ms}ms.")
         return err("Provide 'selector' or 'ms'.")
 
+    elif name == "fetch_many":
+        urls = list(dict.fromkeys(a["urls"]))
+        if not urls:
+            return err("Provide at least one URL.")
+        concurrency = max(1, min(int(a.get("concurrency", 4)), FETCH_MAX_PAGES))
+        sem = asyncio.Semaphore(concurrency)
+        results = await asyncio.gather(*(
+            fetch_text(u, sem, int(a.get("timeout_ms", 20_000)), int(a.get("max_bytes", 8000)))
+            for u in urls
+        ))
+        return ok(json.dumps(results, ensure_ascii=False, indent=1))
+
+    elif name == "set_recording":
+        state = "on" if a["enabled"] else "off"
+        if not await set_recording(bool(a["enabled"])):
+            return ok(f"Recording already {state}.")
+        return ok(f"Recording {state}.")
+
     elif name == "close_browser":
+        session = _session.get()
+        if session != DEFAULT_SESSION:
+            page = _session_pages.pop(session, None)
+            forget_sessions([session])
+            if page:
+                await close_session_page(page)
+            return ok(f"Session {session} closed.")
         await close_all()
         return ok("Browser closed.")
 
     return err(f"Unknown tool: {name}")
 
 
+# ── Browser worker processes ──────────────────────────────────────────────────
+class BrowserSupervisor:
+    """Spread sessions over worker processes, each running its own Chromium.
+
+    A session sticks to the worker it was first assigned to (the least loaded
+    one) until it is closed or evicted there. A worker that dies fails its
+    in-flight calls and is restarted in the same slot, so its sessions
+    continue there with a fresh browser. Browser-wide tools run on every
+    worker.
+    """
+
+    def __init__(self, workers: int):
+        self.size = workers
+        self.procs = [None] * workers
+        self.conns = [None] * workers
+        self.restarts = [0] * workers
+        self.started = [0.0] * workers
+        self.backoff = [0] * workers
+        self.sessions = {}  # session id -> worker index
+        self.pending = {}   # call id -> (worker index, future)
+        self.next_call = 0
+        self.loop = None
+        self.stopping = False
+        self.record_video = None  # last set_recording, reapplied on restart
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        for index in range(self.size):
+            self._spawn(index)
+
+    def _spawn(self, index: int):
+        if self.stopping:
+            return
+        mp = multiprocessing.get_context("spawn")
+        conn, child_conn = mp.Pipe()
+        proc = mp.Process(target=run_browser_worker, args=(index, child_conn, self.record_video),
+                          name=f"browser-worker-{index}", daemon=True)
+        proc.start()
+        child_conn.close()  # so a dead worker shows up as EOF on conn
+        self.procs[index], self.conns[index] = proc, conn
+        self.started[index] = time.monotonic()
+        threading.Thread(target=self._read, args=(index, conn),
+                         name=f"browser-worker-{index}-reader", daemon=True).start()
+        print(f"[browser-mcp] Browser worker {index} started (pid {proc.pid})", file=sys.stderr)
+
+    def _read(self, index: int, conn):
+        while True:
+            try:
+                call_id, result, closed = conn.recv()
+            except (EOFError, OSError):
+                break
+            self.loop.call_soon_threadsafe(self._resolve, index, call_id, result, closed)
+        self.loop.call_soon_threadsafe(self._worker_died, index, conn)
+
+    def _resolve(self, index: int, call_id: int, result, closed: list[str]):
+        for session in closed:
+            if self.sessions.get(session) == index:
+                del self.sessions[session]
+        entry = self.pending.pop(call_id, None)
+        if entry and not entry[1].done():
+            entry[1].set_result(result)
+
+    def _worker_died(self, index: int, conn):
+        if self.stopping or self.conns[index] is not conn:
+            return
+        conn.close()
+        for call_id, (worker, fut) in list(self.pending.items()):
+            if worker == index:
+                del self.pending[call_id]
+                if not fut.done():
+                    fut.set_exception(RuntimeError(f"Browser worker {index} died"))
+        # Back off when a worker keeps crashing right after start.
+        if time.monotonic() - self.started[index] > 60:
+            self.backoff[index] = 0
+        delay = self.backoff[index]
+        self.backoff[index] = min(30, delay * 2 or 1)
+        self.restarts[index] += 1
+        print(f"[browser-mcp] Browser worker {index} died; restarting in {delay}s", file=sys.stderr)
+        self.loop.call_later(delay, self._spawn, index)
+
+    def worker_for(self, session: str) -> int:
+        index = self.sessions.get(session)
+        if index is None:
+            load = [0] * self.size
+            for worker in self.sessions.values():
+                load[worker] += 1
+            index = self.sessions[session] = load.index(min(load))
+        return index
+
+    async def call(self, name: str, arguments: dict) -> CallToolResult:
+        session = arguments.get("session_id") or DEFAULT_SESSION
+        if name == "set_recording" or (name == "close_browser" and session == DEFAULT_SESSION):
+            return await self.broadcast(name, arguments)
+        return await self.send(self.worker_for(session), name, arguments)
+
+    async def broadcast(self, name: str, arguments: dict) -> CallToolResult:
+        """Run a browser-wide tool on every worker and report each outcome."""
+        results = await asyncio.gather(*(
+            self.send(index, name, arguments) for index in range(self.size)
+        ), return_exceptions=True)
+        if name == "close_browser":
+            self.sessions.clear()
+        lines, failed = [], False
+        for index, res in enumerate(results):
+            if isinstance(res, Exception):
+                lines.append(f"Worker {index}: Error: {type(res).__name__}: {res}")
+                failed = True
+            else:
+                lines.append(f"Worker {index}: {res.content[0].text}")
+                failed = failed or bool(res.isError)
+        if name == "set_recording" and not failed:
+            self.record_video = bool(arguments["enabled"])
+        return CallToolResult(content=[TextContent(type="text", text="\n".join(lines))],
+                              isError=failed)
+
+    async def send(self, index: int, name: str, arguments: dict) -> CallToolResult:
+        self.next_call += 1
+        call_id = self.next_call
+        fut = self.loop.create_future()
+        self.pending[call_id] = (index, fut)
+        try:
+            self.conns[index].send((call_id, name, arguments))
+        except (OSError, ValueError) as e:
+            self.pending.pop(call_id, None)
+            raise RuntimeError(f"Browser worker {index} is restarting") from e
+        return await fut
+
+    async def stop(self):
+        self.stopping = True
+        for conn in self.conns:
+            try:
+                conn.send(None)
+            except (OSError, ValueError, AttributeError):
+                pass
+        for proc in self.procs:
+            if proc:
+                await asyncio.to_thread(proc.join, 15)
+                if proc.is_alive():
+                    proc.terminate()
+
+    def status(self) -> list[dict]:
+        return [{
+            "worker": index,
+            "pid": proc.pid if proc else None,
+            "alive": bool(proc and proc.is_alive()),
+            "sessions": sum(1 for worker in self.sessions.values() if worker == index),
+            "restarts": self.restarts[index],
+        } for index, proc in enumerate(self.procs)]
+
+
+def run_browser_worker(index: int, conn, record_video: bool | None = None):
+    """Entry point of a browser worker process."""
+    global SANDBOX_PROFILE, _record_video, _is_worker
+    _is_worker = True
+    if record_video is not None:
+        _record_video = record_video
+    # stdout carries the MCP stdio protocol of the parent; keep it clean.
+    sys.stdout = sys.stderr
+    # Chromium locks its profile, so every worker needs its own.
+    SANDBOX_PROFILE = SANDBOX_PROFILE.with_name(f"{SANDBOX_PROFILE.name}-worker{index}")
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    asyncio.run(browser_worker_main(conn))
+
+
+async def browser_worker_main(conn):
+    loop = asyncio.get_running_loop()
+    inbox = asyncio.Queue()
+
+    def read():
+        while True:
+            try:
+                msg = conn.recv()
+            except (EOFError, OSError):
+                msg = None
+            loop.call_soon_threadsafe(inbox.put_nowait, msg)
+            if msg is None:
+                return
+
+    async def handle(call_id, name, arguments):
+        result = await run_tool(name, arguments)
+        closed = _closed_sessions[:]
+        _closed_sessions.clear()
+        try:
+            conn.send((call_id, result, closed))
+        except (OSError, ValueError):
+            pass  # supervisor is gone
+        except Exception as e:
+            conn.send((call_id, err(f"{type(e).__name__}: {e}"), closed))
+
+    threading.Thread(target=read, name="browser-worker-reader", daemon=True).start()
+    watchdog_task = asyncio.create_task(watchdog()) if WATCHDOG_INTERVAL > 0 else None
+    tasks = set()
+    try:
+        while (msg := await inbox.get()) is not None:
+            task = asyncio.create_task(handle(*msg))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    finally:
+        if watchdog_task:
+            watchdog_task.cancel()
+        await close_all()
+
+
 # ── HTTP Recording Server ─────────────────────────────────────────────────────
+# The recording API runs in its own process by default so that large
+# downloads or deletes never stall browser tool calls on this event loop.
 HTTP_PORT = int(os.getenv("MCP_HTTP_PORT", "80"))
+CONTROL_PORT = int(os.getenv("MCP_CONTROL_PORT", "8081"))
+RECORDINGS_PROCESS = os.getenv("MCP_RECORDINGS_PROCESS", "true").strip().lower() in {"1", "true", "yes", "on"}
+RECORDING_IO_CONCURRENCY = int(os.getenv("MCP_RECORDING_IO_CONCURRENCY", "4"))
 
 RECORDING_EXTENSIONS = {".webm"}
 
+_recording_io = asyncio.Semaphore(RECORDING_IO_CONCURRENCY)
+_recording_api = {"pid": None, "restarts": 0, "last_exitcode": None}
+
+
+async def run_recording_io(func, *args):
+    """Run blocking file work in a thread, at most RECORDING_IO_CONCURRENCY at once."""
+    async with _recording_io:
+        return await asyncio.to_thread(func, *args)
+
 
 def _list_recordings() -> list[dict]:
     """Return metadata for all recording files, sorted newest first."""
@@ -379,9 +1399,28 @@ def _list_recordings() -> list[dict]:
     return files
 
 
+def _encode_recording(file_path: Path) -> str:
+    """Return the download response body for file_path as a JSON string."""
+    data = file_path.read_bytes()
+    return json.dumps({
+        "filename": file_path.name,
+        "size_bytes": len(data),
+        "base64": base64.b64encode(data).decode(),
+    })
+
+
+def _delete_recordings() -> list[str]:
+    deleted = []
+    for ext in RECORDING_EXTENSIONS:
+        for f in RECORD_VIDEO_DIR.glob(f"*{ext}"):
+            f.unlink()
+            deleted.append(f.name)
+    return deleted
+
+
 async def handle_list_recordings(request):
     """GET /recordings — lists all recording files."""
-    recordings = _list_recordings()
+    recordings = await run_recording_io(_list_recordings)
     return aiohttp_web.json_response({"recordings": recordings, "count": len(recordings)})
 
 
@@ -401,44 +1440,172 @@ async def handle_download_recording(request):
     if file_path.suffix.lower() not in RECORDING_EXTENSIONS:
         return aiohttp_web.json_response({"error": "File type not allowed"}, status=400)
 
-    data = base64.b64encode(file_path.read_bytes()).decode()
-    return aiohttp_web.json_response({
-        "filename": filename,
-        "size_bytes": file_path.stat().st_size,
-        "base64": data,
-    })
+    body = await run_recording_io(_encode_recording, file_path)
+    return aiohttp_web.Response(text=body, content_type="application/json")
 
 
 async def handle_delete_recordings(request):
     """DELETE /recordings — deletes all recording files."""
-    deleted = []
-    for ext in RECORDING_EXTENSIONS:
-        for f in RECORD_VIDEO_DIR.glob(f"*{ext}"):
-            f.unlink()
-            deleted.append(f.name)
+    deleted = await run_recording_io(_delete_recordings)
     return aiohttp_web.json_response({"deleted": deleted, "count": len(deleted)})
 
 
-async def start_http_server():
+def build_recording_app():
     http_app = aiohttp_web.Application()
     http_app.router.add_get("/recordings", handle_list_recordings)
     http_app.router.add_get("/recording/download/{filename}", handle_download_recording)
     http_app.router.add_delete("/recordings", handle_delete_recordings)
+    return http_app
+
+
+def run_recording_server():
+    """Entry point of the recording API process."""
+    # stdout carries the MCP stdio protocol of the parent; keep it clean.
+    sys.stdout = sys.stderr
+    print(f"[browser-mcp] Recording API on port {HTTP_PORT} (pid {os.getpid()})", file=sys.stderr)
+    aiohttp_web.run_app(build_recording_app(), host="0.0.0.0", port=HTTP_PORT, print=None)
+
+
+async def keep_recording_process():
+    """Run the recording API process, restarting it with backoff when it exits."""
+    mp = multiprocessing.get_context("spawn")
+    backoff = 0
+    while True:
+        proc = mp.Process(target=run_recording_server, name="recording-api", daemon=True)
+        proc.start()
+        _recording_api["pid"] = proc.pid
+        started = time.monotonic()
+        try:
+            await asyncio.to_thread(proc.join)
+        except asyncio.CancelledError:
+            proc.terminate()
+            raise
+        # e.g. MCP_HTTP_PORT already taken, or a crash; back off when it
+        # keeps dying right after start.
+        if time.monotonic() - started > 60:
+            backoff = 0
+        delay, backoff = backoff, min(30, backoff * 2 or 1)
+        _recording_api.update(pid=None, restarts=_recording_api["restarts"] + 1,
+                              last_exitcode=proc.exitcode)
+        print(f"[browser-mcp] Recording API process exited with code {proc.exitcode}; "
+              f"restarting in {delay}s", file=sys.stderr)
+        await asyncio.sleep(delay)
+
+
+async def start_recording_server():
+    """Start the recording API in a worker process, or in this loop if disabled."""
+    if RECORDINGS_PROCESS:
+        return asyncio.create_task(keep_recording_process())
+    runner = aiohttp_web.AppRunner(build_recording_app())
+    await runner.setup()
+    await aiohttp_web.TCPSite(runner, "0.0.0.0", HTTP_PORT).start()
+    print(f"[browser-mcp] Recording API on port {HTTP_PORT}", file=sys.stderr)
+    return None
+
+
+# ── HTTP Control Server ───────────────────────────────────────────────────────
+# Routes that need the live browser state stay in this process.
+async def handle_browser_health(request):
+    """GET /browser/health — browser memory, limits and recent recycles."""
+    return aiohttp_web.json_response({
+        "running": _context is not None,
+        "url": _page.url if _page else None,
+        "active_calls": _active_calls,
+        "memory": _memory_sample or None,
+        "limits": {"browser_rss_mb": MAX_BROWSER_RSS_MB, "renderer_rss_mb": MAX_RENDERER_RSS_MB},
+        "recycles": list(_recycle_log),
+        "recording": _record_video,
+        "live_viewers": len(_live_viewers),
+        "workers": _supervisor.status() if _supervisor else None,
+        "recording_api": dict(_recording_api) if RECORDINGS_PROCESS else None,
+    })
+
+
+async def _pump_frames(queue: asyncio.Queue, send):
+    while True:
+        await send(await queue.get())
+
+
+async def handle_live_mjpeg(request):
+    """GET /live — MJPEG stream of the main page (open it in a browser or <img>)."""
+    resp = aiohttp_web.StreamResponse(headers={
+        "Content-Type": "multipart/x-mixed-replace; boundary=frame",
+        "Cache-Control": "no-cache",
+    })
+
+    async def send(frame):
+        await resp.write(b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: "
+                         + str(len(frame)).encode() + b"\r\n\r\n" + frame + b"\r\n")
+
+    try:
+        queue = await add_live_viewer()
+    except Exception as e:
+        return aiohttp_web.json_response({"error": f"{type(e).__name__}: {e}"}, status=503)
+    try:
+        await resp.prepare(request)
+        await _pump_frames(queue, send)
+    except ConnectionResetError:
+        pass
+    finally:
+        await remove_live_viewer(queue)
+    return resp
+
+
+async def handle_live_ws(request):
+    """GET /live/ws — WebSocket sending each JPEG frame as a binary message."""
+    ws = aiohttp_web.WebSocketResponse(heartbeat=30)
+    await ws.prepare(request)
+    try:
+        queue = await add_live_viewer()
+    except Exception as e:
+        await ws.close(code=WSCloseCode.INTERNAL_ERROR,
+                       message=f"{type(e).__name__}: {e}"[:120].encode())
+        return ws
+    pump = asyncio.create_task(_pump_frames(queue, ws.send_bytes))
+    try:
+        async for _ in ws:
+            pass  # viewers don't send anything; this just waits for close
+    finally:
+        pump.cancel()
+        await remove_live_viewer(queue)
+    return ws
+
+
+async def start_http_server():
+    http_app = aiohttp_web.Application()
+    http_app.router.add_get("/browser/health", handle_browser_health)
+    http_app.router.add_get("/live", handle_live_mjpeg)
+    http_app.router.add_get("/live/ws", handle_live_ws)
     runner = aiohttp_web.AppRunner(http_app)
     await runner.setup()
-    site = aiohttp_web.TCPSite(runner, "0.0.0.0", HTTP_PORT)
+    site = aiohttp_web.TCPSite(runner, "0.0.0.0", CONTROL_PORT)
     await site.start()
-    print(f"[browser-mcp] HTTP server on port {HTTP_PORT}", file=sys.stderr)
+    print(f"[browser-mcp] HTTP server on port {CONTROL_PORT}", file=sys.stderr)
 
 
 # ── Entry point ───────────────────────────────────────────────────────────────
 async def main():
+    global _supervisor
+    recording_task = await start_recording_server()
+    if BROWSER_WORKERS > 0:
+        _supervisor = BrowserSupervisor(BROWSER_WORKERS)
+        _supervisor.start()
     await start_http_server()
+    watchdog_task = asyncio.create_task(watchdog()) if WATCHDOG_INTERVAL > 0 else None
     async with stdio_server() as (r, w):
         try:
             await app.run(r, w, app.create_initialization_options())
         finally:
+            if watchdog_task:
+                watchdog_task.cancel()
             await close_all()
+            if _http_client is not None:
+                await _http_client.aclose()
+            if recording_task:
+                recording_task.cancel()
+                await asyncio.gather(recording_task, return_exceptions=True)
+            if _supervisor:
+                await _supervisor.stop()
 
 
 if __name__ == "__main__":
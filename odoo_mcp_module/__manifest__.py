@@ -7,6 +7,7 @@
     "data": [
         "security/ir.model.access.csv",
         "views/mcp_access_views.xml",
+        "views/mcp_slow_call_views.xml",
     ],
     "installable": True,
     "application": False,
@@ -1,6 +1,26 @@
-from odoo import http
+import base64
+import functools
+import json
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+
+from odoo import SUPERUSER_ID, api, http
 from odoo.exceptions import AccessDenied
 from odoo.http import request
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Aggregated per worker process; with several Odoo workers each one reports
+# its own share of the traffic.
+_METRICS = {}
+_METRICS_LOCK = threading.Lock()
+# Per-request state: the login verified by _authenticate, and the stats of a
+# successful call waiting for ir.http._post_dispatch to add the response size.
+_CALL = threading.local()
+_CHANGES_MAX_LIMIT = 5000
 
 
 def _truthy(value):
@@ -41,6 +61,7 @@ def _authenticate(payload):
         uid = request.session.authenticate(db, login, api_key)
         if not uid:
             raise AccessDenied("Invalid Odoo credentials")
+        _CALL.login = login
         return request.env(user=uid)
     if require_auth:
         raise AccessDenied("Authentication required")
@@ -69,6 +90,126 @@ def _check_model_access(model: str, operation: str):
         raise AccessDenied("Operation not allowed for this model")
 
 
+def _encode_cursor(write_date, record_id, tombstone_id):
+    data = {
+        "write_date": write_date.isoformat(sep=" ") if write_date else None,
+        "id": record_id,
+        "tombstone_id": tombstone_id,
+    }
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def _decode_cursor(cursor):
+    if not cursor:
+        return None, 0, None
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        write_date = data.get("write_date")
+        if write_date:
+            write_date = datetime.fromisoformat(write_date)
+        return write_date, int(data.get("id") or 0), data.get("tombstone_id")
+    except (TypeError, ValueError, AttributeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _record_metrics(key, stats):
+    with _METRICS_LOCK:
+        entry = _METRICS.get(key)
+        if entry is None:
+            entry = _METRICS[key] = {
+                "calls": 0,
+                "errors": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "sql_count": 0,
+                "sql_ms": 0.0,
+                "bytes_in": 0,
+                "bytes_out": 0,
+            }
+        entry["calls"] += 1
+        entry["errors"] += int(stats["error"])
+        entry["total_ms"] += stats["duration_ms"]
+        entry["max_ms"] = max(entry["max_ms"], stats["duration_ms"])
+        entry["sql_count"] += stats["sql_count"]
+        entry["sql_ms"] += stats["sql_ms"]
+        entry["bytes_in"] += stats["bytes_in"]
+        entry["bytes_out"] += stats["bytes_out"]
+
+
+def _log_slow_call(values):
+    try:
+        params = request.env["ir.config_parameter"].sudo()
+        threshold = float(params.get_param("mcp.slow_call_ms", "1000") or 0)
+        if threshold <= 0 or values["duration_ms"] < threshold:
+            return
+        # Separate cursor so the entry survives a rolled back request.
+        with request.env.registry.cursor() as cr:
+            api.Environment(cr, SUPERUSER_ID, {})["mcp.slow.call"].create(values)
+    except Exception:
+        _logger.warning("Could not log slow MCP call", exc_info=True)
+
+
+def _finish_call(stats):
+    key = (stats["operation"], stats["res_model"], stats["login"])
+    _record_metrics(key, stats)
+    _log_slow_call(stats)
+
+
+def _flush_call_metrics(response):
+    stats = getattr(_CALL, "pending", None)
+    if stats is None:
+        return
+    _CALL.pending = None
+    stats["bytes_out"] = response.content_length or 0
+    _finish_call(stats)
+
+
+def _instrumented(operation):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, **payload):
+            # Odoo resets these per request and sql_db increments them on
+            # every query, including the ones made while authenticating.
+            thread = threading.current_thread()
+            sql_count = getattr(thread, "query_count", 0)
+            sql_time = getattr(thread, "query_time", 0.0)
+            _CALL.login = None
+            _CALL.pending = None
+            start = time.perf_counter()
+            error = False
+            try:
+                return func(self, **payload)
+            except Exception:
+                error = True
+                raise
+            finally:
+                # Only verified logins and installed models become metric
+                # keys, so callers cannot grow _METRICS with made-up values.
+                model = payload.get("model")
+                if not isinstance(model, str) or model not in request.env.registry:
+                    model = False
+                stats = {
+                    "operation": operation,
+                    "res_model": model,
+                    "login": _CALL.login or False,
+                    "duration_ms": (time.perf_counter() - start) * 1000,
+                    "sql_count": getattr(thread, "query_count", 0) - sql_count,
+                    "sql_ms": (getattr(thread, "query_time", 0.0) - sql_time) * 1000,
+                    "bytes_in": len(request.httprequest.get_data(cache=True)),
+                    "bytes_out": 0,
+                    "error": error,
+                }
+                if error:
+                    _finish_call(stats)
+                else:
+                    # Recorded once Odoo has serialized the response.
+                    _CALL.pending = stats
+
+        return wrapper
+
+    return decorator
+
+
 class MCPController(http.Controller):
     @http.route(
         "/mcp/ping",
@@ -77,6 +218,7 @@ class MCPController(http.Controller):
         methods=["POST"],
         csrf=False,
     )
+    @_instrumented("ping")
     def ping(self, **payload):
         _require_token(payload)
         _authenticate(payload)
@@ -89,6 +231,7 @@ class MCPController(http.Controller):
         methods=["POST"],
         csrf=False,
     )
+    @_instrumented("models")
     def models(self, **payload):
         _require_token(payload)
         _authenticate(payload)
@@ -118,6 +261,7 @@ class MCPController(http.Controller):
         methods=["POST"],
         csrf=False,
     )
+    @_instrumented("fields")
     def fields(self, **payload):
         _require_token(payload)
         env = _authenticate(payload)
@@ -135,6 +279,7 @@ class MCPController(http.Controller):
         methods=["POST"],
         csrf=False,
     )
+    @_instrumented("search_read")
     def search_read(self, **payload):
         _require_token(payload)
         env = _authenticate(payload)
@@ -162,6 +307,7 @@ class MCPController(http.Controller):
         methods=["POST"],
         csrf=False,
     )
+    @_instrumented("read")
     def read(self, **payload):
         _require_token(payload)
         env = _authenticate(payload)
@@ -180,6 +326,7 @@ class MCPController(http.Controller):
         methods=["POST"],
         csrf=False,
     )
+    @_instrumented("create")
     def create(self, **payload):
         _require_token(payload)
         env = _authenticate(payload)
@@ -201,6 +348,7 @@ class MCPController(http.Controller):
         methods=["POST"],
         csrf=False,
     )
+    @_instrumented("write")
     def write(self, **payload):
         _require_token(payload)
         env = _authenticate(payload)
@@ -220,6 +368,7 @@ class MCPController(http.Controller):
         methods=["POST"],
         csrf=False,
     )
+    @_instrumented("unlink")
     def unlink(self, **payload):
         _require_token(payload)
         env = _authenticate(payload)
@@ -230,3 +379,109 @@ class MCPController(http.Controller):
         ids = payload.get("ids") or []
         deleted = env[model].browse(ids).unlink()
         return {"deleted": bool(deleted), "count": len(ids)}
+
+    @http.route(
+        "/mcp/changes",
+        type="json",
+        auth="none",
+        methods=["POST"],
+        csrf=False,
+    )
+    @_instrumented("changes")
+    def changes(self, **payload):
+        _require_token(payload)
+        env = _authenticate(payload)
+        model = payload.get("model")
+        if not model:
+            raise ValueError("model is required")
+        _check_model_access(model, "read")
+        Model = env[model]
+        if "write_date" not in Model._fields:
+            raise ValueError(f"{model} has no write_date and cannot be synced")
+        domain = payload.get("domain") or []
+        fields = payload.get("fields") or None
+        limit = max(1, min(int(payload.get("limit") or 500), _CHANGES_MAX_LIMIT))
+        # Archiving is a change too: unless the caller filters on active,
+        # archived records are returned (with active=False) so mirrors see them.
+        filters_active = any(
+            isinstance(leaf, (list, tuple)) and leaf and leaf[0] == "active"
+            for leaf in domain
+        )
+        if "active" in Model._fields and not filters_active:
+            Model = Model.with_context(active_test=False)
+            if fields and "active" not in fields:
+                fields = [*fields, "active"]
+        write_date, last_id, tombstone_id = _decode_cursor(payload.get("cursor"))
+
+        # Keyset pagination on (write_date, id): with the index created for
+        # tracked models, each poll only touches rows changed since the cursor.
+        query = Model._search(domain, limit=limit, order="write_date, id")
+        write_date_col = SQL.identifier(query.table, "write_date")
+        id_col = SQL.identifier(query.table, "id")
+        if write_date:
+            query.add_where(
+                SQL("(%s, %s) > (%s, %s)", write_date_col, id_col, write_date, last_id)
+            )
+        env.cr.execute(query.select(id_col, write_date_col))
+        rows = env.cr.fetchall()
+        if rows:
+            last_id, write_date = rows[-1]
+        if len(rows) < limit and write_date:
+            # write_date is the start time of the writing transaction, so rows
+            # committed after this poll can still land behind the last one we
+            # saw. Once caught up, hold the cursor back by the lag so the next
+            # poll scans that window again; clients upsert records by id.
+            params = request.env["ir.config_parameter"].sudo()
+            lag = float(params.get_param("mcp.changes_lag_seconds", "120") or 0)
+            horizon = env.cr.now() - timedelta(seconds=lag)
+            if write_date > horizon:
+                write_date, last_id = horizon, 0
+        records = Model.browse([row[0] for row in rows]).read(fields=fields)
+
+        Tombstone = request.env["mcp.tombstone"].sudo()
+        deleted = []
+        if tombstone_id is None:
+            # First sync: only deletions from now on are relevant.
+            last = Tombstone.search([], order="id desc", limit=1)
+            tombstone_id = last.id or 0
+        elif payload.get("include_deletions", True):
+            tombstones = Tombstone.search(
+                [("model", "=", model), ("id", ">", tombstone_id)],
+                order="id",
+                limit=limit,
+            )
+            deleted = tombstones.mapped("res_id")
+            if tombstones:
+                tombstone_id = tombstones[-1].id
+
+        return {
+            "records": records,
+            "deleted": deleted,
+            "cursor": _encode_cursor(write_date, last_id, tombstone_id),
+            "has_more": len(rows) == limit or len(deleted) == limit,
+        }
+
+    @http.route(
+        "/mcp/metrics",
+        type="json",
+        auth="none",
+        methods=["POST"],
+        csrf=False,
+    )
+    def metrics(self, **payload):
+        _require_token(payload)
+        env = _authenticate(payload)
+        # Covers every caller's traffic and can be reset for the whole worker.
+        if not env.uid or not env.user.has_group("base.group_system"):
+            raise AccessDenied("MCP metrics require the Administration / Settings group")
+        with _METRICS_LOCK:
+            result = [
+                dict(entry, operation=key[0], model=key[1], login=key[2])
+                for key, entry in _METRICS.items()
+            ]
+            if payload.get("reset"):
+                _METRICS.clear()
+        for entry in result:
+            entry["avg_ms"] = entry["total_ms"] / entry["calls"]
+        result.sort(key=lambda entry: entry["total_ms"], reverse=True)
+        return result
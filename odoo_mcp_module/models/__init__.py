@@ -1 +1,4 @@
+from . import ir_http
 from . import mcp_access
+from . import mcp_slow_call
+from . import mcp_tombstone
@@ -0,0 +1,12 @@
+from odoo import models
+
+from ..controllers.mcp import _flush_call_metrics
+
+
+class IrHttp(models.AbstractModel):
+    _inherit = "ir.http"
+
+    @classmethod
+    def _post_dispatch(cls, response):
+        super()._post_dispatch(response)
+        _flush_call_metrics(response)
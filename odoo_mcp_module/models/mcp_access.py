@@ -1,4 +1,5 @@
-from odoo import fields, models
+from odoo import api, fields, models, tools
+from odoo.tools.sql import create_index, make_index_name
 
 
 class McpModelAccess(models.Model):
@@ -16,7 +17,51 @@ class McpModelAccess(models.Model):
     can_create = fields.Boolean(default=False)
     can_write = fields.Boolean(default=False)
     can_unlink = fields.Boolean(default=False)
+    track_changes = fields.Boolean(
+        default=False,
+        help="Index write_date for the change feed and record deletions as tombstones.",
+    )
 
     _sql_constraints = [
         ("mcp_model_unique", "unique(model_id)", "Model must be unique."),
     ]
+
+    @api.model
+    @tools.ormcache()
+    def _tracked_models(self):
+        records = self.sudo().search([("track_changes", "=", True)])
+        return frozenset(records.model_id.mapped("model"))
+
+    def _ensure_change_index(self):
+        for rec in self.filtered("track_changes"):
+            if rec.model_id.model not in self.env:
+                continue
+            model = self.env[rec.model_id.model]
+            if model._abstract or not model._auto:
+                continue
+            table = model._table
+            create_index(
+                self.env.cr,
+                make_index_name(table, "mcp_changes"),
+                table,
+                ['"write_date"', '"id"'],
+            )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._ensure_change_index()
+        self.env.registry.clear_cache()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        if "track_changes" in vals or "model_id" in vals:
+            self._ensure_change_index()
+            self.env.registry.clear_cache()
+        return result
+
+    def unlink(self):
+        result = super().unlink()
+        self.env.registry.clear_cache()
+        return result
@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+
+class McpSlowCall(models.Model):
+    _name = "mcp.slow.call"
+    _description = "MCP Slow Call"
+    _order = "create_date desc, id desc"
+
+    operation = fields.Char(required=True, index=True)
+    res_model = fields.Char(string="Model", index=True)
+    login = fields.Char(index=True)
+    duration_ms = fields.Float(string="Duration (ms)", aggregator="avg")
+    sql_count = fields.Integer(string="SQL Queries", aggregator="avg")
+    sql_ms = fields.Float(string="SQL Time (ms)", aggregator="avg")
+    bytes_in = fields.Integer(string="Bytes In", aggregator="avg")
+    bytes_out = fields.Integer(string="Bytes Out", aggregator="avg")
+    error = fields.Boolean()
+
+    @api.autovacuum
+    def _gc_slow_calls(self):
+        params = self.env["ir.config_parameter"].sudo()
+        days = int(params.get_param("mcp.slow_call_days", "30") or 0)
+        if days <= 0:
+            return
+        cutoff = fields.Datetime.now() - timedelta(days=days)
+        self.search([("create_date", "<", cutoff)]).unlink()
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from odoo import api, fields, models
+
+
+class McpTombstone(models.Model):
+    _name = "mcp.tombstone"
+    _description = "MCP Deleted Record"
+    _order = "id"
+    _log_access = False
+
+    model = fields.Char(required=True, index=True)
+    res_id = fields.Integer(required=True)
+    deleted_at = fields.Datetime(required=True, default=fields.Datetime.now)
+
+    @api.model
+    def _record(self, model, ids):
+        return self.create([{"model": model, "res_id": res_id} for res_id in ids])
+
+    @api.autovacuum
+    def _gc_tombstones(self):
+        params = self.env["ir.config_parameter"].sudo()
+        days = int(params.get_param("mcp.tombstone_days", "30") or 0)
+        if days <= 0:
+            return
+        cutoff = fields.Datetime.now() - timedelta(days=days)
+        self.search([("deleted_at", "<", cutoff)]).unlink()
+
+
+class Base(models.AbstractModel):
+    _inherit = "base"
+
+    def unlink(self):
+        if (
+            self.ids
+            and "mcp.model.access" in self.env
+            and self._name in self.env["mcp.model.access"]._tracked_models()
+        ):
+            self.env["mcp.tombstone"].sudo()._record(self._name, self.ids)
+        return super().unlink()
@@ -0,0 +1,266 @@
+"""
+Odoo MCP benchmark
+──────────────────
+Starts the stub Odoo server in a subprocess, then drives `OdooMCPClient` and
+the FastMCP tools from `server.py` at a fixed concurrency. Reports throughput,
+latency percentiles and memory per scenario, optionally saves them as JSON and
+compares them against a stored baseline.
+
+    python bench/run.py --concurrency 32 --requests 2000 --output results.json
+    python bench/run.py --baseline bench/baseline.json          # exit 1 on regression
+    python bench/run.py --baseline bench/baseline.json --update-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import socket
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(BENCH_DIR.parent))
+
+import stub_odoo  # noqa: E402
+
+# Compared against the baseline; higher is worse unless listed in HIGHER_IS_BETTER.
+COMPARED_METRICS = ["throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+HIGHER_IS_BETTER = {"throughput_rps"}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for_port(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Stub server did not start on port {port}")
+
+
+def _rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and bytes on macOS.
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def build_scenarios(server, records: int) -> dict:
+    client = server.client
+    ids = list(range(1, min(records, 50) + 1))
+    fields = ["name", "email", "amount"]
+    return {
+        "client.ping": lambda i: client.ping(),
+        "client.fields": lambda i: client.fields("res.partner"),
+        "client.search_read": lambda i: client.search_read(
+            "res.partner", fields=fields, limit=100, offset=(i * 100) % max(records, 1)),
+        "client.read": lambda i: client.read("res.partner", ids, fields=fields),
+        "client.changes": lambda i: client.changes("res.partner", fields=fields, limit=100),
+        "client.metrics": lambda i: client.metrics(),
+        "tool.search_read": lambda i: server.mcp.call_tool(
+            "search_read", {"model": "res.partner", "fields": fields, "limit": 100}),
+        "tool.read_by_ids": lambda i: server.mcp.call_tool(
+            "read_by_ids", {"model": "res.partner", "ids": ids, "fields": fields}),
+        "tool.update_records": lambda i: server.mcp.call_tool(
+            "update_records", {"model": "res.partner", "ids": [1 + i % 50],
+                               "values": {"name": f"bench {i}"}}),
+    }
+
+
+async def run_scenario(factory, requests: int, concurrency: int, trace_memory: bool) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    first_error = None
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors, first_error
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                await factory(i)
+            except Exception as e:
+                errors += 1
+                first_error = first_error or f"{type(e).__name__}: {e}"
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    rss_before = _rss_mb()
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    alloc_peak = None
+    if trace_memory:
+        alloc_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    rss_after = _rss_mb()
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "error_rate": round(errors / requests, 4) if requests else 0.0,
+        "first_error": first_error,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+        "p50_ms": round(_percentile(latencies, 50), 3),
+        "p95_ms": round(_percentile(latencies, 95), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        # ru_maxrss is a process-wide high-water mark that includes earlier
+        # scenarios; the growth is how far this one pushed it up.
+        "process_rss_peak_mb": rss_after,
+        "rss_peak_growth_mb": (round(rss_after - rss_before, 3)
+                               if rss_after is not None else None),
+        "alloc_peak_mb": round(alloc_peak, 3) if alloc_peak is not None else None,
+    }
+
+
+async def run_all(args, base_url: str) -> dict:
+    os.environ["ODOO_BASE_URL"] = base_url
+    for var in ("ODOO_DB", "ODOO_MCP_TOKEN", "ODOO_LOGIN", "ODOO_API_KEY"):
+        os.environ.setdefault(var, "bench")
+    import server  # noqa: E402  (reads its settings from the env on import)
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    scenarios = build_scenarios(server, args.records)
+    selected = args.scenario or list(scenarios)
+    results = {}
+    for name in selected:
+        factory = scenarios[name]
+        await run_scenario(factory, min(args.warmup, args.requests), args.concurrency, False)
+        results[name] = await run_scenario(factory, args.requests, args.concurrency, args.trace_memory)
+        r = results[name]
+        print(f"{name:24} {r['throughput_rps']:>9.1f} req/s  p50 {r['p50_ms']:>8.2f} ms  "
+              f"p95 {r['p95_ms']:>8.2f} ms  p99 {r['p99_ms']:>8.2f} ms  errors {r['errors']}",
+              file=sys.stderr)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = base.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            if worse > tolerance:
+                regressions.append(f"{name}.{metric}: {old} -> {new} ({change:+.1%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Odoo MCP server against a stub Odoo.")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--records", type=int, default=5000, help="Synthetic records per model")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Stub server latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--scenario", action="append", help="Run only this scenario (repeatable)")
+    parser.add_argument("--stub-url", help="Use an already running stub instead of starting one")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Report peak Python allocations (slows the run down)")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Compare against this results file")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Overwrite --baseline with these results instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Allowed relative regression before failing (default 0.15)")
+    args = parser.parse_args()
+
+    stub = None
+    base_url = args.stub_url
+    if not base_url:
+        port = _free_port()
+        stub = multiprocessing.Process(
+            target=stub_odoo.serve,
+            args=("127.0.0.1", port, args.records, args.latency_ms, args.jitter_ms),
+            daemon=True,
+        )
+        stub.start()
+        _wait_for_port(port)
+        base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        scenarios = asyncio.run(run_all(args, base_url))
+    finally:
+        if stub:
+            stub.terminate()
+            stub.join()
+
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "records": args.records,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+        },
+        "scenarios": scenarios,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    # Failed calls return fast and would read as a speedup, so any error
+    # fails the run before the baseline is updated or compared.
+    failed = {name: r for name, r in scenarios.items() if r["errors"]}
+    for name, r in failed.items():
+        print(f"ERRORS {name}: {r['errors']}/{r['requests']} failed, first: {r['first_error']}",
+              file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+    if args.baseline and args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2))
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+    elif args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("config") != results["config"]:
+            print("Warning: baseline was recorded with a different config", file=sys.stderr)
+        regressions = compare(scenarios, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
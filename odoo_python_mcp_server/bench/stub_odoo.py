@@ -0,0 +1,238 @@
+"""
+Stub Odoo server for benchmarks
+───────────────────────────────
+Imitates the JSON endpoints of `odoo_mcp_module` with a synthetic in-memory
+dataset and configurable latency, so the MCP server can be measured without
+a real Odoo instance.
+
+    python stub_odoo.py --port 8169 --records 5000 --latency-ms 5
+"""
+
+import argparse
+import base64
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+MODELS = ["res.partner", "product.product", "sale.order"]
+
+FIELDS = {
+    "id": {"type": "integer", "string": "ID"},
+    "name": {"type": "char", "string": "Name"},
+    "email": {"type": "char", "string": "Email"},
+    "active": {"type": "boolean", "string": "Active"},
+    "amount": {"type": "float", "string": "Amount"},
+    "note": {"type": "text", "string": "Note"},
+    "write_date": {"type": "datetime", "string": "Last Updated on"},
+}
+
+
+def build_dataset(records: int, seed: int = 42) -> dict[str, dict[int, dict]]:
+    rng = random.Random(seed)
+    dataset = {}
+    for model in MODELS:
+        rows = {}
+        for i in range(1, records + 1):
+            rows[i] = {
+                "id": i,
+                "name": f"{model} {i}",
+                "email": f"user{i}@example.com",
+                "active": rng.random() > 0.1,
+                "amount": round(rng.uniform(0, 10_000), 2),
+                "note": " ".join(rng.choice(["lorem", "ipsum", "dolor", "sit", "amet"])
+                                 for _ in range(rng.randint(5, 40))),
+                "write_date": f"2024-01-01 00:00:{i % 60:02d}",
+            }
+        dataset[model] = rows
+    return dataset
+
+
+def _change_key(row: dict) -> tuple[str, int]:
+    return row.get("write_date") or "", row["id"]
+
+
+def _decode_cursor(cursor: str | None) -> dict:
+    if not cursor:
+        return {}
+    return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+
+def _encode_cursor(write_date: str | None, record_id: int, tombstone_id: int) -> str:
+    data = {"write_date": write_date, "id": record_id, "tombstone_id": tombstone_id}
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+
+def _project(row: dict, fields: list[str] | None) -> dict:
+    if not fields:
+        return dict(row)
+    return {"id": row["id"], **{f: row.get(f, False) for f in fields}}
+
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())
+
+
+class StubOdoo:
+    def __init__(self, records: int, latency_ms: float, jitter_ms: float, seed: int = 42):
+        self.dataset = build_dataset(records, seed)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.lock = threading.Lock()
+        self.next_id = records + 1
+        self.tombstones: list[tuple[int, str, int]] = []  # (id, model, res_id)
+        self.change_order: dict[str, list[dict]] = {}
+
+    def changed(self, model: str):
+        self.change_order.pop(model, None)
+
+    def ordered(self, model: str) -> list[dict]:
+        rows = self.change_order.get(model)
+        if rows is None:
+            rows = self.change_order[model] = sorted(self.dataset[model].values(), key=_change_key)
+        return rows
+
+    def sleep(self):
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def rows(self, payload: dict) -> dict[int, dict]:
+        model = payload.get("model")
+        if model not in self.dataset:
+            raise ValueError(f"Unknown model: {model}")
+        return self.dataset[model]
+
+    def handle(self, op: str, payload: dict):
+        if op == "ping":
+            return {"ok": True}
+        if op == "models":
+            return [{"model": m, "name": m, "transient": False, "can_read": True,
+                     "can_create": True, "can_write": True, "can_unlink": True}
+                    for m in MODELS]
+        if op == "fields":
+            self.rows(payload)
+            names = payload.get("field_names")
+            return {k: v for k, v in FIELDS.items() if not names or k in names}
+        if op == "search_read":
+            rows = list(self.rows(payload).values())
+            offset = int(payload.get("offset") or 0)
+            limit = int(payload.get("limit") or 0) or len(rows)
+            fields = payload.get("fields")
+            return [_project(r, fields) for r in rows[offset:offset + limit]]
+        if op == "read":
+            rows = self.rows(payload)
+            fields = payload.get("fields")
+            return [_project(rows[i], fields) for i in payload.get("ids") or [] if i in rows]
+        if op == "create":
+            rows = self.rows(payload)
+            with self.lock:
+                new_id = self.next_id
+                self.next_id += 1
+            rows[new_id] = {"id": new_id, **(payload.get("values") or {}), "write_date": _now()}
+            self.changed(payload["model"])
+            return {"id": new_id}
+        if op == "write":
+            rows = self.rows(payload)
+            ids = payload.get("ids") or []
+            for i in ids:
+                if i in rows:
+                    rows[i].update(payload.get("values") or {}, write_date=_now())
+            self.changed(payload["model"])
+            return {"updated": True, "count": len(ids)}
+        if op == "unlink":
+            rows = self.rows(payload)
+            ids = payload.get("ids") or []
+            with self.lock:
+                for i in ids:
+                    if rows.pop(i, None):
+                        self.tombstones.append((len(self.tombstones) + 1, payload["model"], i))
+            self.changed(payload["model"])
+            return {"deleted": True, "count": len(ids)}
+        if op == "changes":
+            self.rows(payload)
+            model = payload["model"]
+            limit = int(payload.get("limit") or 500)
+            cursor = _decode_cursor(payload.get("cursor"))
+            after = (cursor.get("write_date") or "", int(cursor.get("id") or 0))
+            page = [r for r in self.ordered(model) if _change_key(r) > after][:limit]
+            write_date, last_id = cursor.get("write_date"), int(cursor.get("id") or 0)
+            if page:
+                write_date, last_id = _change_key(page[-1])
+            tombstone_id = cursor.get("tombstone_id")
+            deleted = []
+            if tombstone_id is None:
+                tombstone_id = len(self.tombstones)
+            elif payload.get("include_deletions", True):
+                new = [t for t in self.tombstones[tombstone_id:] if t[1] == model][:limit]
+                deleted = [t[2] for t in new]
+                if new:
+                    tombstone_id = new[-1][0]
+            return {
+                "records": [_project(r, payload.get("fields")) for r in page],
+                "deleted": deleted,
+                "cursor": _encode_cursor(write_date, last_id, tombstone_id),
+                "has_more": len(page) == limit or len(deleted) == limit,
+            }
+        if op == "metrics":
+            return []
+        raise ValueError(f"Unknown operation: {op}")
+
+
+def make_handler(stub: StubOdoo):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body go out as separate writes; without TCP_NODELAY the
+        # body waits on the client's delayed ACK (~40 ms per response).
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            op = self.path.split("?", 1)[0].rsplit("/", 1)[-1]
+            stub.sleep()
+            try:
+                body = {"jsonrpc": "2.0", "id": None, "result": stub.handle(op, payload)}
+            except Exception as e:
+                body = {"jsonrpc": "2.0", "id": None,
+                        "error": {"message": str(e), "data": {"message": str(e)}}}
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def serve(host: str, port: int, records: int, latency_ms: float, jitter_ms: float):
+    stub = StubOdoo(records, latency_ms, jitter_ms)
+    server = StubServer((host, port), make_handler(stub))
+    print(f"[stub-odoo] Serving {records} records/model on http://{host}:{port}", file=sys.stderr)
+    server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub Odoo MCP endpoints for benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8169)
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    serve(args.host, args.port, args.records, args.latency_ms, args.jitter_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,28 @@
+import argparse
+import asyncio
+import hmac
+import ipaddress
 import os
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+
+TRANSPORTS = ("stdio", "sse", "streamable-http")
+
+# Per-session credentials, read from the HTTP request of the
+# streamable-http/sse transports. Same headers the Odoo module accepts. A
+# session that sends any of them uses exactly what it sent, never a mix with
+# the server's own credentials.
+CREDENTIAL_HEADERS = {
+    "db": "X-Odoo-Db",
+    "token": "X-MCP-Token",
+    "login": "X-Odoo-Login",
+    "api_key": "X-Odoo-Api-Key",
+}
+
+METADATA_CACHE_SIZE = 1024
 
 
 class OdooMCPClient:
@@ -13,12 +33,71 @@ class OdooMCPClient:
         token: Optional[str],
         login: Optional[str],
         api_key: Optional[str],
+        max_connections: int = 20,
+        metadata_ttl: float = 300.0,
+        http: Optional[httpx.AsyncClient] = None,
+        metadata_cache: Optional[Dict[Tuple, Tuple[float, Any]]] = None,
     ):
         self.base_url = base_url.rstrip("/")
         self.db = db
         self.token = token
         self.login = login
         self.api_key = api_key
+        self.max_connections = max_connections
+        self.metadata_ttl = metadata_ttl
+        # Shared with clients derived through with_credentials(); only the
+        # client that created the pool closes it.
+        self._http = http
+        self._owns_http = http is None
+        self._metadata_cache = {} if metadata_cache is None else metadata_cache
+
+    def with_credentials(self, **credentials: Optional[str]) -> "OdooMCPClient":
+        """Return a client using other credentials but this client's pool and cache."""
+        return OdooMCPClient(
+            base_url=self.base_url,
+            db=credentials.get("db"),
+            token=credentials.get("token"),
+            login=credentials.get("login"),
+            api_key=credentials.get("api_key"),
+            max_connections=self.max_connections,
+            metadata_ttl=self.metadata_ttl,
+            http=self._get_http(),
+            metadata_cache=self._metadata_cache,
+        )
+
+    def _get_http(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        if self._owns_http and self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _cached(self, path: str, payload: Dict[str, Any]) -> Any:
+        """POST metadata requests through a TTL cache keyed by credentials."""
+        if self.metadata_ttl <= 0:
+            return await self._post(path, payload)
+        key = (
+            self.db, self.token, self.login, self.api_key, path,
+            payload.get("model"), tuple(payload.get("field_names") or ()),
+        )
+        now = time.monotonic()
+        hit = self._metadata_cache.get(key)
+        if hit and hit[0] > now:
+            return hit[1]
+        result = await self._post(path, payload)
+        if len(self._metadata_cache) >= METADATA_CACHE_SIZE:
+            self._metadata_cache.pop(next(iter(self._metadata_cache)))
+        self._metadata_cache[key] = (now + self.metadata_ttl, result)
+        return result
 
     def _endpoint(self, path: str) -> str:
         url = f"{self.base_url}{path}"
@@ -50,16 +129,15 @@ class OdooMCPClient:
             payload["api_key"] = self.api_key
         if self.db and "db" not in payload:
             payload["db"] = self.db
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(self._endpoint(path), json=payload)
-            response.raise_for_status()
-            return self._unwrap(response.json())
+        response = await self._get_http().post(self._endpoint(path), json=payload)
+        response.raise_for_status()
+        return self._unwrap(response.json())
 
     async def ping(self) -> Dict[str, Any]:
         return await self._post("/mcp/ping", {})
 
     async def models(self) -> List[Dict[str, Any]]:
-        return await self._post("/mcp/models", {})
+        return await self._cached("/mcp/models", {})
 
     async def fields(
         self, model: str, field_names: Optional[List[str]] = None
@@ -67,7 +145,7 @@ class OdooMCPClient:
         payload: Dict[str, Any] = {"model": model}
         if field_names:
             payload["field_names"] = field_names
-        return await self._post("/mcp/fields", payload)
+        return await self._cached("/mcp/fields", payload)
 
     async def search_read(
         self,
@@ -112,6 +190,30 @@ class OdooMCPClient:
         payload: Dict[str, Any] = {"model": model, "ids": ids}
         return await self._post("/mcp/unlink", payload)
 
+    async def changes(
+        self,
+        model: str,
+        cursor: Optional[str] = None,
+        domain: Optional[List[Any]] = None,
+        fields: Optional[List[str]] = None,
+        limit: int = 500,
+        include_deletions: bool = True,
+    ) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {
+            "model": model,
+            "domain": domain or [],
+            "limit": limit,
+            "include_deletions": include_deletions,
+        }
+        if cursor:
+            payload["cursor"] = cursor
+        if fields:
+            payload["fields"] = fields
+        return await self._post("/mcp/changes", payload)
+
+    async def metrics(self, reset: bool = False) -> List[Dict[str, Any]]:
+        return await self._post("/mcp/metrics", {"reset": reset})
+
 
 def _get_client() -> OdooMCPClient:
     base_url = os.getenv("ODOO_BASE_URL", "http://localhost:8069")
@@ -120,35 +222,70 @@ def _get_client() -> OdooMCPClient:
     login = os.getenv("ODOO_LOGIN")
     api_key = os.getenv("ODOO_API_KEY")
     return OdooMCPClient(
-        base_url=base_url, db=db, token=token, login=login, api_key=api_key
+        base_url=base_url,
+        db=db,
+        token=token,
+        login=login,
+        api_key=api_key,
+        max_connections=int(os.getenv("ODOO_MCP_MAX_CONNECTIONS", "20")),
+        metadata_ttl=float(os.getenv("ODOO_MCP_METADATA_TTL", "300")),
     )
 
 
-mcp = FastMCP("Odoo MCP")
+def _client_for(ctx: Optional[Context]) -> OdooMCPClient:
+    """Return the shared client, with credentials from the session's HTTP headers if any."""
+    try:
+        request = ctx.request_context.request if ctx else None
+    except (AttributeError, ValueError):
+        request = None
+    if request is None:
+        return client
+    credentials = {
+        name: request.headers.get(header)
+        for name, header in CREDENTIAL_HEADERS.items()
+        if request.headers.get(header)
+    }
+    if not credentials:
+        return client
+    if not (credentials.get("login") and credentials.get("api_key")):
+        raise PermissionError(
+            "Send X-Odoo-Login and X-Odoo-Api-Key together to use your own credentials"
+        )
+    return client.with_credentials(**credentials)
+
+
+mcp = FastMCP(
+    "Odoo MCP",
+    host=os.getenv("ODOO_MCP_HOST", "127.0.0.1"),
+    port=int(os.getenv("ODOO_MCP_PORT", "8000")),
+)
 client = _get_client()
 
 
 @mcp.tool()
-async def ping() -> Dict[str, Any]:
+async def ping(ctx: Context) -> Dict[str, Any]:
     """Check connectivity to the Odoo MCP module."""
-    return await client.ping()
+    return await _client_for(ctx).ping()
 
 
 @mcp.tool()
-async def list_models() -> List[Dict[str, Any]]:
+async def list_models(ctx: Context) -> List[Dict[str, Any]]:
     """List all models available in Odoo."""
-    return await client.models()
+    return await _client_for(ctx).models()
 
 
 @mcp.tool()
-async def list_fields(model: str, field_names: Optional[List[str]] = None) -> Dict[str, Any]:
+async def list_fields(
+    model: str, ctx: Context, field_names: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """Get field definitions for a model."""
-    return await client.fields(model=model, field_names=field_names)
+    return await _client_for(ctx).fields(model=model, field_names=field_names)
 
 
 @mcp.tool()
 async def search_read(
     model: str,
+    ctx: Context,
     domain: Optional[List[Any]] = None,
     fields: Optional[List[str]] = None,
     limit: int = 100,
@@ -156,7 +293,7 @@ async def search_read(
     order: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """Search and read records from a model."""
-    return await client.search_read(
+    return await _client_for(ctx).search_read(
         model=model,
         domain=domain,
         fields=fields,
@@ -170,31 +307,143 @@ async def search_read(
 async def read_by_ids(
     model: str,
     ids: List[int],
+    ctx: Context,
     fields: Optional[List[str]] = None,
 ) -> List[Dict[str, Any]]:
     """Read records by ID list."""
-    return await client.read(model=model, ids=ids, fields=fields)
+    return await _client_for(ctx).read(model=model, ids=ids, fields=fields)
 
 
 @mcp.tool()
 async def create_record(
-    model: str, values: Dict[str, Any], fields: Optional[List[str]] = None
+    model: str,
+    values: Dict[str, Any],
+    ctx: Context,
+    fields: Optional[List[str]] = None,
 ) -> Any:
     """Create a record in a model."""
-    return await client.create(model=model, values=values, fields=fields)
+    return await _client_for(ctx).create(model=model, values=values, fields=fields)
 
 
 @mcp.tool()
-async def update_records(model: str, ids: List[int], values: Dict[str, Any]) -> Any:
+async def update_records(
+    model: str, ids: List[int], values: Dict[str, Any], ctx: Context
+) -> Any:
     """Update records by ID list."""
-    return await client.write(model=model, ids=ids, values=values)
+    return await _client_for(ctx).write(model=model, ids=ids, values=values)
 
 
 @mcp.tool()
-async def delete_records(model: str, ids: List[int]) -> Any:
+async def delete_records(model: str, ids: List[int], ctx: Context) -> Any:
     """Delete records by ID list."""
-    return await client.unlink(model=model, ids=ids)
+    return await _client_for(ctx).unlink(model=model, ids=ids)
+
+
+@mcp.tool()
+async def sync_changes(
+    model: str,
+    ctx: Context,
+    cursor: Optional[str] = None,
+    domain: Optional[List[Any]] = None,
+    fields: Optional[List[str]] = None,
+    limit: int = 500,
+    include_deletions: bool = True,
+) -> Dict[str, Any]:
+    """Return records created or modified since `cursor`, plus deleted IDs.
+
+    Omit `cursor` for the first sync, then pass back the returned `cursor`.
+    Keep calling while `has_more` is true. Once caught up, the cursor stays
+    `mcp.changes_lag_seconds` behind so late commits are not missed; records
+    changed in that window are returned again, so upsert them by ID.
+    Archived records are included with `active` false unless `domain`
+    filters on `active`; `limit` is capped at 5000.
+    """
+    return await _client_for(ctx).changes(
+        model=model,
+        cursor=cursor,
+        domain=domain,
+        fields=fields,
+        limit=limit,
+        include_deletions=include_deletions,
+    )
+
+
+@mcp.tool()
+async def get_metrics(ctx: Context, reset: bool = False) -> List[Dict[str, Any]]:
+    """Get per-endpoint MCP call statistics from the Odoo worker that answers."""
+    return await _client_for(ctx).metrics(reset=reset)
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _require_bearer(app, token: str):
+    """Wrap an ASGI app so HTTP requests need `Authorization: Bearer <token>`."""
+    expected = f"Bearer {token}".encode()
+
+    async def guarded(scope, receive, send):
+        if scope["type"] == "http":
+            provided = dict(scope["headers"]).get(b"authorization", b"")
+            if not hmac.compare_digest(provided, expected):
+                await send({
+                    "type": "http.response.start",
+                    "status": 401,
+                    "headers": [(b"content-type", b"text/plain"),
+                                (b"www-authenticate", b"Bearer")],
+                })
+                await send({"type": "http.response.body", "body": b"Unauthorized"})
+                return
+        await app(scope, receive, send)
+
+    return guarded
+
+
+async def _serve_http(transport: str) -> None:
+    import uvicorn
+
+    # Sessions without credential headers act as ODOO_LOGIN, so the port
+    # must not be reachable by anyone who can connect to it.
+    token = os.getenv("ODOO_MCP_AUTH_TOKEN")
+    host = mcp.settings.host
+    if not token and not _is_loopback(host):
+        raise SystemExit(
+            f"Refusing to serve {transport} on {host} without ODOO_MCP_AUTH_TOKEN"
+        )
+    app = mcp.sse_app() if transport == "sse" else mcp.streamable_http_app()
+    if token:
+        app = _require_bearer(app, token)
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=mcp.settings.port,
+        log_level=mcp.settings.log_level.lower(),
+    )
+    await uvicorn.Server(config).serve()
+
+
+async def _serve(transport: str) -> None:
+    try:
+        if transport == "stdio":
+            await mcp.run_stdio_async()
+        else:
+            await _serve_http(transport)
+    finally:
+        # uvicorn drains in-flight requests on SIGINT/SIGTERM before returning.
+        await client.aclose()
 
 
 if __name__ == "__main__":
-    mcp.run()
+    parser = argparse.ArgumentParser(description="Odoo MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=TRANSPORTS,
+        default=os.getenv("ODOO_MCP_TRANSPORT", "stdio"),
+        help="stdio (default) or a shared HTTP server for many sessions",
+    )
+    asyncio.run(_serve(parser.parse_args().transport))